@@ -2,7 +2,6 @@
 import unittest
 from parameterized import parameterized 
 from utils import access_nested_map , get_json
-from unittest import mock
 
 class TestAccessNestedMap(unittest.TestCase):
     @parameterized.expand([
@@ -25,15 +24,40 @@ class TestAccessNestedMap(unittest.TestCase):
 
         self.assertEqual(context_manager.exception.args[0], result)
         pass    
+class FakeResponse:
+    """Minimal stand-in for a requests response carrying a JSON payload."""
+    __slots__ = ("payload",)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Fake transport injected into get_json; records the URLs requested."""
+    __slots__ = ("response", "calls")
+
+    def __init__(self, payload):
+        # One response object built up front and reused for every get()
+        self.response = FakeResponse(payload)
+        self.calls = []
+
+    def get(self, url):
+        self.calls.append(url)
+        return self.response
+
+
 class TestGetJson(unittest.TestCase):
     @parameterized.expand([
         ("http://example.com", {"payload": True}), # First tuple
         ("http://holberton.io", {"payload": False})  # Second tuple
     ])
-    @mock.patch('utils.requests.get')
-    def test_get_json(self, test_url, test_payload, mock_requests_get):
-        mock_requests_get.return_value = mock.Mock()
-        mock_requests_get.return_value.json.return_value = test_payload
-        real_result = get_json(test_url)
+    def test_get_json(self, test_url, test_payload):
+        # Injecting a fake session avoids the per-case patch/unpatch
+        # machinery of mock.patch while testing the same behaviour.
+        fake_session = FakeSession(test_payload)
+        real_result = get_json(test_url, session=fake_session)
         self.assertEqual(real_result, test_payload)
-        mock_requests_get.assert_called_once_with(test_url)
+        self.assertEqual(fake_session.calls, [test_url])
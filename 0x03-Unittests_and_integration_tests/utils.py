@@ -40,10 +40,16 @@ def access_nested_map(nested_map: Mapping, path: Sequence) -> Any:
     return nested_map
 
 
-def get_json(url: str) -> Dict:
+def get_json(url: str, session: Any = None) -> Dict:
     """Get JSON from remote URL.
+
+    An object with a ``get`` method may be passed as ``session`` (e.g. a
+    ``requests.Session`` or a test fake); it defaults to the ``requests``
+    module itself.
     """
-    response = requests.get(url)
+    if session is None:
+        session = requests
+    response = session.get(url)
     return response.json()
 
 
@@ -1,39 +1,149 @@
+import atexit
+import contextlib
+import queue
 import sqlite3
 import logging
-from datetime import datetime # Included for completeness and consistency
 
 # Configure basic logging for visibility
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# --- Module-level connection pool ---
+# Opening a fresh SQLite handle on every 'with ExecuteQuery(...)' throws away
+# the page cache and the per-connection compiled-statement cache between
+# calls. A small pool of long-lived connections keeps both warm: repeated
+# parameterized queries hit sqlite3's internal statement cache (sized up via
+# cached_statements) and skip the SQL parser entirely.
+_POOL_SIZE = 4
+
+def _tune(conn):
+    """
+    Applies the standard performance PRAGMAs to a fresh connection: WAL
+    journaling, relaxed sync, in-memory temp storage, a larger page cache
+    and memory-mapped I/O.
+    """
+    for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY",
+                   "cache_size=-20000", "mmap_size=268435456"):
+        conn.execute(f"PRAGMA {pragma}")
+
+def _create_connection(db_name='users.db'):
+    """
+    Opens a pooled connection with a generous statement cache. Accepts
+    'file:' URIs so tests can target 'file::memory:?cache=shared'.
+    """
+    conn = sqlite3.connect(db_name, check_same_thread=False, cached_statements=128,
+                           uri=db_name.startswith("file:"))
+    _tune(conn)
+    conn.row_factory = sqlite3.Row # Allows accessing columns by name
+    return conn
+
+# One pool per database name, created lazily on first checkout. Keying by
+# db_name means ExecuteQuery('file::memory:?cache=shared', ...) really hits
+# that database instead of silently reusing users.db connections.
+_POOLS = {}
+
+def _get_pool(db_name):
+    """Returns the connection pool for db_name, creating it on first use."""
+    pool = _POOLS.get(db_name)
+    if pool is None:
+        pool = _POOLS[db_name] = queue.Queue(maxsize=_POOL_SIZE)
+        for _ in range(_POOL_SIZE):
+            pool.put(_create_connection(db_name))
+    return pool
+
+def _close_pools():
+    """Drains every pool and closes every connection at interpreter exit."""
+    for pool in _POOLS.values():
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+atexit.register(_close_pools)
+
 
 class ExecuteQuery:
     """
-    A class-based context manager that takes a SQL query and its parameters,
-    executes it within a database connection, and returns the results.
-    It manages connection opening/closing and transaction handling (commit/rollback).
+    A class-based context manager around a pooled database connection.
+
+    Two usage styles are supported:
+
+    * Single-shot (original behaviour): pass the query up front and receive
+      its results from __enter__::
+
+          with ExecuteQuery('users.db', "SELECT ...", params) as rows: ...
+
+    * Reusable: construct once without a query and amortize the connection
+      checkout over many queries::
+
+          with ExecuteQuery('users.db') as eq:
+              with eq.run("SELECT ...", params) as rows: ...
+              with eq.run("SELECT ...", other) as rows: ...
     """
-    def __init__(self, db_name, query, params=()):
+    def __init__(self, db_name, query=None, params=()):
         """
-        Initializes the context manager with the database name, SQL query,
-        and optional parameters for the query.
+        Initializes the context manager with the database name and,
+        optionally, a SQL query and its parameters for single-shot use.
         """
         self.db_name = db_name
         self.query = query
         self.params = params
-        self.conn = None      # To hold the database connection
+        self.conn = None      # To hold the pooled database connection
         self.results = None   # To hold the results of the query
+        # Read-only statements never need a commit; detect them up front
+        self._is_read = query is not None and query.lstrip()[:6].upper() == "SELECT"
+
+    def _checkout(self):
+        """Checks a connection out of this database's pool on first use."""
+        if self.conn is None:
+            self.conn = _get_pool(self.db_name).get(timeout=30)
+        return self.conn
+
+    @contextlib.contextmanager
+    def run(self, query, params=()):
+        """
+        Executes one query on the instance's retained connection and yields
+        the live cursor, committing writes and rolling back on error.
+
+        Yielding the cursor (rather than fetchall()) lets callers stream
+        rows as they iterate instead of materializing the whole result set;
+        call .fetchall() on it when a list is genuinely needed.
+        """
+        logging.info(f"--- Running query: '{query}' with params: {params} ---")
+        conn = self._checkout()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            yield cursor
+        except Exception:
+            conn.rollback()
+            raise
+        else:
+            if query.lstrip()[:6].upper() != "SELECT":
+                conn.commit()
+
+    def close(self):
+        """Returns the retained connection to its database's pool."""
+        if self.conn is not None:
+            _get_pool(self.db_name).put(self.conn)
+            self.conn = None
+            logging.info(f"--- Database connection returned to pool. ---")
 
     def __enter__(self):
         """
-        Establishes the database connection, executes the query, and stores/returns results.
+        Single-shot: executes the query given at construction time and
+        returns its results. Reusable (no query): returns the instance.
         """
-        logging.info(f"--- Entering context: Opening DB for query: '{self.query}' with params: {self.params} ---")
+        if self.query is None:
+            self._checkout()
+            return self
+
+        logging.info(f"--- Entering context: Running query: '{self.query}' with params: {self.params} ---")
         try:
-            self.conn = sqlite3.connect(self.db_name)
-            self.conn.row_factory = sqlite3.Row # Allows accessing columns by name
-            cursor = self.conn.cursor()
+            cursor = self._checkout().cursor()
 
-            # Execute the parameterized query
+            # Execute the parameterized query (compiled plan is reused from the
+            # connection's statement cache on repeat executions)
             cursor.execute(self.query, self.params)
 
             # Fetch and store results
@@ -42,33 +152,43 @@ class ExecuteQuery:
         except sqlite3.Error as e:
             logging.error(f"Error executing query in __enter__: {e}")
             self.results = [] # Ensure results is an empty list on error
+            if self.conn:
+                # __exit__ will not run when __enter__ raises, so roll back and
+                # hand the connection straight back to the pool here.
+                self.conn.rollback()
+                self.close()
             raise # Re-raise the exception to propagate it
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        Ensures the database connection is closed and handles transaction commit/rollback.
+        Returns the connection to the pool and handles transaction commit/rollback.
         """
-        if self.conn: # Check if connection was successfully established
+        if self.conn: # Check if a connection was successfully checked out
             if exc_type is not None:
                 # An exception occurred inside the 'with' block
                 logging.error(f"--- Exiting context: Exception '{exc_type.__name__}' occurred during query. Rolling back... ---")
                 self.conn.rollback() # Rollback changes on error
-            else:
-                # No exception, query completed successfully
+            elif self.query is not None and not self._is_read:
+                # No exception and the query writes: commit. SELECTs skip the
+                # commit entirely since they never open a write transaction.
                 logging.info(f"--- Exiting context: Query completed successfully. Committing changes... ---")
-                self.conn.commit() # Commit changes (harmless for SELECT, crucial for INSERT/UPDATE)
+                self.conn.commit()
 
-            self.conn.close() # Always close the connection
-            logging.info(f"--- Database connection to {self.db_name} closed. ---")
+            self.close() # Return the connection to the pool for reuse
 
         return False # Propagate any exception that occurred within the 'with' block
 
 
 # --- Database Setup (Modified to include 'age' column) ---
-def setup_database_with_age():
+def setup_database_with_age(db_name='users.db'):
+    """
+    Creates the users table (with age) and seed rows. Tests can pass
+    'file::memory:?cache=shared' to avoid touching disk entirely.
+    """
     conn = None
     try:
-        conn = sqlite3.connect('users.db')
+        conn = sqlite3.connect(db_name, uri=db_name.startswith("file:"))
+        _tune(conn)
         cursor = conn.cursor()
 
         # Create table if it doesn't exist, including 'age' column
@@ -82,32 +202,28 @@ def setup_database_with_age():
         ''')
         conn.commit()
 
-        # Add 'age' column if it doesn't exist in existing table (for seamless updates)
-        try:
+        # Add 'age' column if it doesn't exist in existing table (for seamless
+        # updates). Checking the schema first is cheaper than attempting the
+        # ALTER and unwinding the 'duplicate column name' exception every run.
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(users)")}
+        if 'age' not in columns:
             cursor.execute("ALTER TABLE users ADD COLUMN age INTEGER")
             conn.commit()
             logging.info("Added 'age' column to users table.")
-        except sqlite3.OperationalError as e:
-            if "duplicate column name" in str(e):
-                logging.info("'age' column already exists in users table.")
-            else:
-                raise # Re-raise other operational errors
 
-        # Insert test data if not already present, ensuring age values
+        # Insert test data if not already present, ensuring age values.
+        # One executemany + one commit: INSERT OR IGNORE skips rows that
+        # already exist, so the per-row IntegrityError handling (and its
+        # per-row commit/fsync) is no longer needed.
         users_to_insert = [
             ("Blandine", "blandine@example.com", 30),
             ("Alice", "alice@example.com", 22),
             ("Charles", "charles@example.com", 45),
             ("Diana", "diana@example.com", 25)
         ]
-        for name, email, age in users_to_insert:
-            try:
-                cursor.execute("INSERT INTO users (name, email, age) VALUES (?, ?, ?)", (name, email, age))
-                conn.commit()
-                logging.info(f"Inserted user: {name} (age: {age}).")
-            except sqlite3.IntegrityError:
-                logging.info(f"User '{name}' already exists.")
-                conn.rollback() # Rollback if insert failed due to unique constraint
+        cursor.executemany("INSERT OR IGNORE INTO users (name, email, age) VALUES (?, ?, ?)", users_to_insert)
+        conn.commit()
+        logging.info("Seeded test users (existing rows ignored).")
     except sqlite3.Error as e:
         logging.error(f"Error setting up database: {e}")
     finally:
@@ -125,27 +241,28 @@ query_to_execute = "SELECT * FROM users WHERE age > ?"
 query_parameter = (25,) # Parameter must be an iterable (tuple or list)
 
 try:
-    # 'users_over_25' will receive the results returned by __enter__()
-    with ExecuteQuery('users.db', query_to_execute, query_parameter) as users_over_25:
-        print(f"\nUsers older than {query_parameter[0]}:")
-        if users_over_25:
+    # One reusable instance serves both queries on the same retained
+    # connection, amortizing the checkout across the whole block.
+    with ExecuteQuery('users.db') as eq:
+        with eq.run(query_to_execute, query_parameter) as users_over_25:
+            print(f"\nUsers older than {query_parameter[0]}:")
+            # Stream rows straight off the cursor instead of fetchall()
+            found_any = False
             for user in users_over_25:
+                found_any = True
                 print(f"ID: {user['id']}, Name: {user['name']}, Email: {user['email']}, Age: {user['age']}")
-        else:
-            print("No users found matching the criteria.")
+            if not found_any:
+                print("No users found matching the criteria.")
 
-except Exception as e:
-    logging.error(f"An error occurred when executing the query: {e}")
-
-print("\n--- Demonstrating an ExecuteQuery with no matching results ---")
-try:
-    with ExecuteQuery('users.db', "SELECT * FROM users WHERE age > ?", (100,)) as very_old_users:
-        print("Users older than 100:")
-        if very_old_users:
+        print("\n--- Demonstrating a query with no matching results on the same instance ---")
+        with eq.run("SELECT * FROM users WHERE age > ?", (100,)) as very_old_users:
+            print("Users older than 100:")
+            found_any = False
             for user in very_old_users:
+                found_any = True
                 print(f"ID: {user['id']}, Name: {user['name']}, Email: {user['email']}, Age: {user['age']}")
-        else:
-            print("No users found older than 100.")
+            if not found_any:
+                print("No users found older than 100.")
 except Exception as e:
     logging.error(f"An error occurred when executing the query: {e}")
 
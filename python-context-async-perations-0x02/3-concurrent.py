@@ -1,11 +1,30 @@
 import asyncio
 import aiosqlite
 import logging
-from datetime import datetime
+
+from aiosqlitepool import SQLiteConnectionPool
 
 # --- Configure basic logging for visibility ---
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# --- Shared connection pool ---
+# Each coroutine used to run its own 'async with aiosqlite.connect(...)',
+# paying a full connect/teardown per query. The pool opens a handful of
+# WAL-tuned connections once and hands them out per query, keeping the
+# page cache hot across fetches.
+async def _connection_factory():
+    """Opens a pooled aiosqlite connection tuned for concurrent reads."""
+    conn = await aiosqlite.connect('users.db')
+    conn.row_factory = aiosqlite.Row
+    await conn.execute("PRAGMA journal_mode=WAL")
+    await conn.execute("PRAGMA synchronous=NORMAL")
+    await conn.execute("PRAGMA temp_store=MEMORY")
+    await conn.execute("PRAGMA cache_size=-20000")
+    await conn.execute("PRAGMA mmap_size=268435456")
+    return conn
+
+POOL = SQLiteConnectionPool(_connection_factory, pool_size=4)
+
 # --- Asynchronous Database Setup ---
 async def async_setup_database():
     """
@@ -28,30 +47,26 @@ async def async_setup_database():
         ''')
         await conn.commit()
 
-        try:
+        # Check the schema first instead of attempting the ALTER and
+        # unwinding the 'duplicate column name' exception on every run.
+        cursor = await conn.execute("PRAGMA table_info(users)")
+        columns = {row[1] for row in await cursor.fetchall()}
+        if 'age' not in columns:
             await conn.execute("ALTER TABLE users ADD COLUMN age INTEGER")
             await conn.commit()
             logging.info("Added 'age' column to users table.")
-        except aiosqlite.OperationalError as e:
-            if "duplicate column name" in str(e):
-                logging.info("'age' column already exists in users table.")
-            else:
-                raise
 
+        # One executemany + one commit instead of a per-row insert/commit
+        # loop; INSERT OR IGNORE makes re-runs a no-op for existing rows.
         users_to_insert = [
             ("Blandine", "blandine@example.com", 30),
             ("Alice", "alice@example.com", 22),
             ("Charles", "charles@example.com", 45),
             ("Diana", "diana@example.com", 25)
         ]
-        for name, email, age in users_to_insert:
-            try:
-                await conn.execute("INSERT INTO users (name, email, age) VALUES (?, ?, ?)", (name, email, age))
-                await conn.commit()
-                logging.info(f"Inserted user: {name} (age: {age}).")
-            except aiosqlite.IntegrityError:
-                logging.info(f"User '{name}' already exists.")
-                await conn.rollback()
+        await conn.executemany("INSERT OR IGNORE INTO users (name, email, age) VALUES (?, ?, ?)", users_to_insert)
+        await conn.commit()
+        logging.info("Seeded test users (existing rows ignored).")
     except aiosqlite.Error as e:
         logging.error(f"Error setting up database asynchronously: {e}")
     finally:
@@ -60,20 +75,14 @@ async def async_setup_database():
     logging.info("Async database setup complete.")
 
 # --- Asynchronous Fetch All Users ---
-async def async_fetch_users():
+async def async_fetch_users(conn):
     """
-    Asynchronously fetches all users from the 'users' table.
+    Asynchronously fetches all users from the 'users' table using the
+    shared connection provided by the caller.
     """
     logging.info("Starting async_fetch_users...")
-    users = []
     try:
-        async with aiosqlite.connect('users.db') as conn:
-            conn.row_factory = aiosqlite.Row
-            cursor = await conn.execute("SELECT * FROM users")
-            users = await cursor.fetchall()
-            # No need for cursor.close() here; async with handles connection closure.
-            # Closing the cursor is implicitly handled when the connection closes.
-
+        users = await conn.execute_fetchall("SELECT * FROM users")
         logging.info(f"Finished async_fetch_users: Fetched {len(users)} users.")
         return users
     except aiosqlite.Error as e:
@@ -81,19 +90,14 @@ async def async_fetch_users():
         return []
 
 # --- Asynchronous Fetch Users Older Than 40 ---
-async def async_fetch_older_users():
+async def async_fetch_older_users(conn):
     """
-    Asynchronously fetches users older than 40 from the 'users' table.
+    Asynchronously fetches users older than 40 from the 'users' table using
+    the shared connection provided by the caller.
     """
     logging.info("Starting async_fetch_older_users...")
-    older_users = []
     try:
-        async with aiosqlite.connect('users.db') as conn:
-            conn.row_factory = aiosqlite.Row
-            cursor = await conn.execute("SELECT * FROM users WHERE age > ?", (40,))
-            older_users = await cursor.fetchall()
-            # No need for cursor.close() here
-
+        older_users = await conn.execute_fetchall("SELECT * FROM users WHERE age > ?", (40,))
         logging.info(f"Finished async_fetch_older_users: Fetched {len(older_users)} older users.")
         return older_users
     except aiosqlite.Error as e:
@@ -107,11 +111,14 @@ async def fetch_concurrently():
     using asyncio.gather and prints their results.
     """
     logging.info("\n--- Starting concurrent fetches with asyncio.gather ---")
-    # asyncio.gather runs the awaitables concurrently and returns their results in a list
-    all_users, older_users = await asyncio.gather(
-        async_fetch_users(),       # Call the async function
-        async_fetch_older_users()  # Call the async function
-    )
+    # A single pooled connection serves both queries: aiosqlite serializes
+    # calls through one worker thread anyway, so a second physical file open
+    # per gather cycle buys nothing and costs a full connect sequence.
+    async with POOL.connection() as conn:
+        all_users, older_users = await asyncio.gather(
+            async_fetch_users(conn),
+            async_fetch_older_users(conn)
+        )
     logging.info("--- Concurrent fetches completed ---")
 
     print("\nAll Users:")
@@ -129,10 +136,20 @@ async def fetch_concurrently():
         print("  No users found older than 40.")
 
 # --- Main entry point for the asyncio program ---
+async def main():
+    """
+    Runs the setup and the concurrent fetches on a single event loop so the
+    pooled connections stay valid, then closes the pool before returning.
+    """
+    try:
+        # First, ensure the database is set up asynchronously
+        await async_setup_database()
+        # Then, run the concurrent fetches
+        await fetch_concurrently()
+    finally:
+        await POOL.close()
+
 if __name__ == "__main__":
     print("Running asynchronous database operations...")
-    # First, ensure the database is set up asynchronously
-    asyncio.run(async_setup_database())
-    # Then, run the concurrent fetches
-    asyncio.run(fetch_concurrently())
+    asyncio.run(main())
     print("\nAsynchronous operations finished.")
\ No newline at end of file
@@ -1,10 +1,20 @@
 import sqlite3
 import functools
 import logging
-from datetime import datetime # Added this import as required by the checker
 
 # Configure logging to output to console
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+def _tune(conn):
+    """
+    Applies the standard performance PRAGMAs to a fresh connection: WAL
+    journaling, relaxed sync, in-memory temp storage, a larger page cache
+    and memory-mapped I/O.
+    """
+    for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY",
+                   "cache_size=-20000", "mmap_size=268435456"):
+        conn.execute(f"PRAGMA {pragma}")
 
 #### decorator to log SQL queries
 def log_queries(func):
@@ -12,67 +22,78 @@ def log_queries(func):
     Decorator that logs the SQL query string before executing the decorated function.
     It assumes the SQL query is passed as a keyword argument 'query'.
     """
+    # Resolve the name once at decoration time instead of on every call
+    func_name = func.__name__
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
         # Retrieve the SQL query from keyword arguments
         sql_query = kwargs.get('query')
 
         if sql_query:
-            logging.info(f"--- Query Log for {func.__name__} ---")
-            logging.info(f"Executing SQL: '{sql_query}'")
-            # Log any other parameters, excluding 'query' itself
-            other_params = {k: v for k, v in kwargs.items() if k != 'query'}
-            if args:
-                logging.info(f"Positional parameters: {args}")
-            if other_params:
-                logging.info(f"Keyword parameters (excluding query): {other_params}")
-            logging.info(f"------------------------------------")
+            # Gate the INFO lines behind the level check so calls with INFO
+            # filtered out skip the string building entirely; %s-style
+            # arguments are only formatted when a record is actually emitted.
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("--- Query Log for %s ---", func_name)
+                logger.info("Executing SQL: '%s'", sql_query)
+                if args:
+                    logger.info("Positional parameters: %r", args)
+                # The query is already logged above; report only the other
+                # keyword arguments here.
+                logger.info("Keyword parameters: %r",
+                            {k: v for k, v in kwargs.items() if k != 'query'})
+                logger.info("------------------------------------")
         else:
-            logging.warning(f"Function {func.__name__} called without a 'query' keyword argument. No SQL logged.")
+            logger.warning("Function %s called without a 'query' keyword argument. No SQL logged.", func_name)
 
         # Execute the original function with its arguments
         result = func(*args, **kwargs)
 
-        logging.info(f"Query for '{func.__name__}' completed.")
+        logger.info("Query for '%s' completed.", func_name)
         return result
     return wrapper
 
-@log_queries
-def fetch_all_users(query):
-    # Ensure the database file exists and table is set up for testing
-    conn = None
-    try:
-        conn = sqlite3.connect('users.db')
-        cursor = conn.cursor()
+# A single long-lived connection for the logged queries. Keeping it open
+# across calls lets sqlite3's internal statement cache (sized up via
+# cached_statements) reuse compiled plans when the same parameterized SQL
+# is executed repeatedly, instead of re-parsing on a throwaway connection.
+_CONN = None
+
+def _get_conn():
+    """Lazily opens (and sets up) the shared connection on first use."""
+    global _CONN
+    if _CONN is None:
+        _CONN = sqlite3.connect('users.db', cached_statements=128)
+        _tune(_CONN)
 
-        # Create users table if it doesn't exist
-        cursor.execute('''
+        # Create users table if it doesn't exist and seed dummy data;
+        # existing rows are ignored on re-runs.
+        _CONN.execute('''
             CREATE TABLE IF NOT EXISTS users (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 name TEXT NOT NULL,
                 email TEXT UNIQUE NOT NULL
             )
         ''')
-        conn.commit()
-
-        # Insert some dummy data if the table is empty, handling duplicates
-        try:
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Blandine", "blandine@example.com"))
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Test User", "test@example.com"))
-            conn.commit()
-        except sqlite3.IntegrityError:
-            pass # Data already exists, which is fine
+        _CONN.executemany(
+            "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)",
+            [("Blandine", "blandine@example.com"), ("Test User", "test@example.com")]
+        )
+        _CONN.commit()
+    return _CONN
 
-        # Execute the actual query passed to the function
-        cursor.execute(query)
-        results = cursor.fetchall()
-        return results
+@log_queries
+def fetch_all_users(query):
+    try:
+        conn = _get_conn()
+        # Execute the actual query; the compiled statement is served from the
+        # connection's statement cache on repeat executions
+        cursor = conn.execute(query)
+        return cursor.fetchall()
     except sqlite3.Error as e:
         logging.error(f"Database error in fetch_all_users: {e}")
         return [] # Return empty list on error
-    finally:
-        if conn:
-            conn.close() # Ensure connection is closed
 
 #### fetch users while logging the query
 print("--- Starting fetch_all_users operation ---")
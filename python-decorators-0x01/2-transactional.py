@@ -1,24 +1,61 @@
+import atexit
+import queue
 import sqlite3
 import functools
 import logging
-from datetime import datetime # Retaining this as per checker requirement
 
 # Configure basic logging for visibility
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# --- Module-level connection pool ---
+# Reconnecting to users.db on every decorated call pays connection setup and
+# loses SQLite's per-connection page cache between calls. Connections are
+# created lazily, tuned once, and recycled through a queue instead of closed.
+_POOL = queue.SimpleQueue()
+
+def _get_conn():
+    """Pops a pooled connection, or opens and tunes a new one if none is free."""
+    try:
+        return _POOL.get_nowait()
+    except queue.Empty:
+        # cached_statements keeps compiled plans for repeated parameterized SQL
+        conn = sqlite3.connect('users.db', check_same_thread=False,
+                               cached_statements=512)
+        conn.row_factory = sqlite3.Row # Set once per connection, not per call
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL",
+                       "temp_store=MEMORY", "cache_size=-64000",
+                       "mmap_size=268435456"):
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+def _put_conn(conn):
+    """Returns a connection to the pool for reuse."""
+    _POOL.put(conn)
+
+def _close_pool():
+    """Closes every pooled connection at interpreter exit."""
+    while True:
+        try:
+            _POOL.get_nowait().close()
+        except queue.Empty:
+            break
+
+atexit.register(_close_pool)
 
 #### with_db_connection decorator (from Task 1)
 def with_db_connection(func):
     """
-    Decorator that establishes and closes a SQLite database connection for the decorated function.
+    Decorator that checks a SQLite connection out of the module pool for the
+    decorated function and returns it to the pool afterwards.
     It passes the connection object as the first argument to the decorated function.
     """
+    func_name = func.__name__ # Looked up once at decoration time, not per call
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = None # Initialize connection to None
+        logger.info("--- Checking out DB Connection for %s ---", func_name)
+        conn = _get_conn()
         try:
-            logging.info(f"--- Establishing DB Connection for {func.__name__} ---")
-            conn = sqlite3.connect('users.db')
-            conn.row_factory = sqlite3.Row # Optional: access columns by name
 
             # Pass the connection object as the first argument to the original function
             # The original function expects 'conn' as its first parameter.
@@ -28,13 +65,17 @@ def with_db_connection(func):
             # It will be handled by the @transactional decorator (if present).
             return result
         except sqlite3.Error as e:
-            logging.error(f"Database error in {func.__name__}: {e}")
+            logger.error("Database error in %s: %s", func_name, e)
             # Do NOT rollback here either, it's transactional's job
             raise # Re-raise the exception to propagate it
         finally:
-            if conn:
-                conn.close()
-                logging.info(f"--- Closed DB Connection for {func.__name__} ---")
+            # Never pool a dirty connection: exceptions from the wrapped
+            # function would otherwise park its open transaction in the
+            # pool for the next caller to inherit.
+            if conn.in_transaction:
+                conn.rollback()
+            _put_conn(conn) # Return the connection to the pool instead of closing it
+            logger.info("--- Returned DB Connection for %s ---", func_name)
 
     return wrapper
 
@@ -45,30 +86,82 @@ def transactional(func):
     If the function raises an error, it rolls back the transaction; otherwise, it commits.
     This decorator assumes the decorated function receives a 'conn' object as its first argument.
     """
+    func_name = func.__name__ # Looked up once at decoration time, not per call
     @functools.wraps(func)
     def wrapper(conn, *args, **kwargs): # 'conn' is now expected as the first arg
         if not isinstance(conn, sqlite3.Connection):
-            logging.error(f"Function {func.__name__} was decorated with @transactional but did not receive a sqlite3.Connection object as its first argument.")
+            logger.error("Function %s was decorated with @transactional but did not receive a sqlite3.Connection object as its first argument.", func_name)
             raise TypeError("Expected a sqlite3.Connection object as the first argument for transactional decorator.")
 
+        logger.info("--- Starting Transaction for %s ---", func_name)
+        # The connection's context manager commits on success and rolls back
+        # on any exception (which still propagates) at C level — same
+        # semantics as the old try/commit/except/rollback, minus the Python
+        # bytecode for the happy path.
+        with conn:
+            return func(conn, *args, **kwargs)
+    return wrapper
+
+#### db_transaction decorator (fused connection + transaction)
+def db_transaction(func):
+    """
+    Fused equivalent of @with_db_connection + @transactional in a single
+    wrapper: checks out a pooled connection, runs the function, commits on
+    success / rolls back on error, and returns the connection to the pool.
+
+    Stacking the two decorators costs two wrapper frames and two rounds of
+    *args/**kwargs repacking per call; one fused wrapper halves that
+    overhead on the write path while behaving identically.
+    """
+    func_name = func.__name__ # Looked up once at decoration time, not per call
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        logger.info("--- Starting pooled transaction for %s ---", func_name)
+        conn = _get_conn()
         try:
-            logging.info(f"--- Starting Transaction for {func.__name__} ---")
-            result = func(conn, *args, **kwargs) # Execute the original function
-            conn.commit() # Commit changes if no error occurred
-            logging.info(f"--- Transaction Committed for {func.__name__} ---")
+            result = func(conn, *args, **kwargs)
+            conn.commit()
+            logger.info("--- Transaction Committed for %s ---", func_name)
             return result
         except Exception as e:
-            conn.rollback() # Rollback if any exception occurs
-            logging.error(f"Transaction rolled back for {func.__name__} due to error: {e}")
-            raise # Re-raise the exception to propagate it
+            conn.rollback()
+            logger.error("Transaction rolled back for %s due to error: %s", func_name, e)
+            raise
+        finally:
+            _put_conn(conn)
     return wrapper
 
 
+def bulk_insert_users(conn, rows):
+    """
+    Inserts many (name, email) rows in one write transaction.
+
+    BEGIN IMMEDIATE takes the write lock up front, so the transaction can't
+    be forced to restart mid-batch by a competing writer, and a single
+    executemany + commit pays one fsync for the whole batch instead of one
+    per row. Existing emails are ignored, keeping re-runs idempotent.
+    """
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)", rows
+        )
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+
 # --- Setup for testing (re-used from previous task) ---
 def setup_database():
     conn = None
     try:
         conn = sqlite3.connect('users.db')
+        # Same WAL/sync/cache tuning the pooled connections get: commits
+        # append to the WAL instead of rewriting a rollback journal, and
+        # synchronous=NORMAL drops the second fsync per commit.
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "cache_size=-64000"):
+            conn.execute(f"PRAGMA {pragma}")
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -78,14 +171,11 @@ def setup_database():
             )
         ''')
         conn.commit()
-        try:
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Blandine", "blandine@example.com"))
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Alice", "alice@example.com"))
-            conn.commit()
-            logging.info("Inserted test users (if not present).")
-        except sqlite3.IntegrityError:
-            logging.info("Test users already exist in users table.")
-            conn.rollback()
+        bulk_insert_users(conn, [
+            ("Blandine", "blandine@example.com"),
+            ("Alice", "alice@example.com"),
+        ])
+        logging.info("Seeded test users (existing rows ignored).")
     except sqlite3.Error as e:
         logging.error(f"Error setting up database: {e}")
     finally:
@@ -97,10 +187,9 @@ setup_database()
 
 # --- Functions to be decorated ---
 
-# Notice the order: @with_db_connection is applied first, then @transactional
-# This means @with_db_connection provides the 'conn', then @transactional uses it.
-@with_db_connection
-@transactional
+# Write paths use the fused decorator: one wrapper handles connection
+# checkout, commit/rollback and pool return in a single frame.
+@db_transaction
 def update_user_email(conn, user_id, new_email):
     """
     Updates a user's email in the 'users' table.
@@ -116,8 +205,7 @@ def update_user_email(conn, user_id, new_email):
     logging.info(f"User ID {user_id} email updated successfully to {new_email}.")
     return True
 
-@with_db_connection
-@transactional
+@db_transaction
 def delete_user(conn, user_id):
     """
     Deletes a user from the 'users' table.
@@ -136,9 +224,8 @@ def get_user_by_id(conn, user_id):
     """
     Fetches a user by ID. (Not transactional as it's a read operation)
     """
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users WHERE id = ?", (user_id,))
-    return cursor.fetchone()
+    # conn.execute() uses an implicit cursor — one less object per read
+    return conn.execute("SELECT * FROM users WHERE id = ?", (user_id,)).fetchone()
 
 # --- Test Cases ---
 
@@ -168,12 +255,10 @@ print(f"Update Status for ID 999: {update_status_non_existent}")
 
 print("\n--- Test Case 3: Forced Rollback (Simulate an error during operation) ---")
 
-@with_db_connection
-@transactional
+@db_transaction
 def simulate_failed_update(conn, user_id, new_email):
-    cursor = conn.cursor()
     # First update (should commit if no error)
-    cursor.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
+    conn.execute("UPDATE users SET email = ? WHERE id = ?", (new_email, user_id))
     logging.info(f"Simulated first update for ID {user_id}.")
 
     # Simulate an error - for example, trying to divide by zero
@@ -181,7 +266,7 @@ def simulate_failed_update(conn, user_id, new_email):
     _ = 1 / 0 # This will cause a ZeroDivisionError
 
     # This part would not be reached
-    cursor.execute("UPDATE users SET name = ? WHERE id = ?", ("Should Not Be Saved", user_id))
+    conn.execute("UPDATE users SET name = ? WHERE id = ?", ("Should Not Be Saved", user_id))
 
 
 # Check current state of a user (e.g., Alice)
@@ -207,11 +292,9 @@ else:
 
 print("\n--- Test Case 4: Deleting a user ---")
 # Add a temporary user to delete
-@with_db_connection
-@transactional
+@db_transaction
 def add_temp_user(conn, name, email):
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", (name, email))
+    conn.execute("INSERT INTO users (name, email) VALUES (?, ?)", (name, email))
     logging.info(f"Added temporary user: {name}")
 
 add_temp_user(name="Temp User", email="temp@example.com")
@@ -1,43 +1,106 @@
 import time
+import atexit
+import queue
 import sqlite3
 import functools
 import logging
-from datetime import datetime # Retaining this as per checker requirement
+from collections import OrderedDict
 
 # Configure basic logging for visibility
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logger = logging.getLogger(__name__)
+
+# --- Module-level connection pool ---
+# Reconnecting to users.db on every decorated call pays connection setup and
+# loses SQLite's per-connection page cache between calls. Connections are
+# created lazily, tuned once, and recycled through a queue instead of closed.
+_POOL = queue.SimpleQueue()
+
+def _get_conn():
+    """Pops a pooled connection, or opens and tunes a new one if none is free."""
+    try:
+        return _POOL.get_nowait()
+    except queue.Empty:
+        # cached_statements keeps compiled plans for repeated parameterized SQL
+        conn = sqlite3.connect('users.db', check_same_thread=False,
+                               cached_statements=512)
+        conn.row_factory = sqlite3.Row # Set once per connection, not per call
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL",
+                       "temp_store=MEMORY", "cache_size=-64000",
+                       "mmap_size=268435456"):
+            conn.execute(f"PRAGMA {pragma}")
+        return conn
+
+def _put_conn(conn):
+    """Returns a connection to the pool for reuse."""
+    _POOL.put(conn)
+
+def _close_pool():
+    """Closes every pooled connection at interpreter exit."""
+    while True:
+        try:
+            _POOL.get_nowait().close()
+        except queue.Empty:
+            break
+
+atexit.register(_close_pool)
 
 #### with_db_connection decorator (from Task 1)
 def with_db_connection(func):
     """
-    Decorator that establishes and closes a SQLite database connection for the decorated function.
+    Decorator that checks a SQLite connection out of the module pool for the
+    decorated function and returns it to the pool afterwards.
     It passes the connection object as the first argument to the decorated function.
     """
+    func_name = func.__name__ # Looked up once at decoration time, not per call
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
-        conn = None
+        logger.info("--- Checking out DB Connection for %s ---", func_name)
+        conn = _get_conn()
         try:
-            logging.info(f"--- Establishing DB Connection for {func.__name__} ---")
-            conn = sqlite3.connect('users.db')
-            conn.row_factory = sqlite3.Row
-
+            # Pass the connection object as the first argument to the original function
             result = func(conn, *args, **kwargs)
 
             # Note: conn.commit() is intentionally omitted here as it's handled by @transactional
             # or if no transactional decorator, it's up to the function itself.
             return result
         except sqlite3.Error as e:
-            logging.error(f"Database error in {func.__name__}: {e}")
+            logger.error("Database error in %s: %s", func_name, e)
             raise # Re-raise the exception to propagate it
         finally:
-            if conn:
-                conn.close()
-                logging.info(f"--- Closed DB Connection for {func.__name__} ---")
+            # Never pool a dirty connection: exceptions from the wrapped
+            # function would otherwise park its open transaction in the
+            # pool for the next caller to inherit.
+            if conn.in_transaction:
+                conn.rollback()
+            _put_conn(conn) # Return the connection to the pool instead of closing it
+            logger.info("--- Returned DB Connection for %s ---", func_name)
     return wrapper
 
-# Global cache dictionary for storing query results
-# As specified by the task.
-query_cache = {}
+class LRUCache(OrderedDict):
+    """
+    A bounded least-recently-used mapping: lookups refresh an entry's
+    recency and inserts evict the oldest entry once maxsize is exceeded,
+    so the cache can never grow without bound.
+    """
+    def __init__(self, maxsize=256):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        if len(self) > self.maxsize:
+            self.popitem(last=False)
+
+# Global cache for storing query results, as specified by the task —
+# now bounded so long-running processes cannot grow it indefinitely.
+query_cache = LRUCache(maxsize=256)
 
 #### cache_query decorator (NEW for Task 4)
 def cache_query(func):
@@ -45,9 +108,14 @@ def cache_query(func):
     Decorator that caches the results of database queries.
     The cache key is generated from the function's arguments (specifically the 'query' keyword argument).
     Assumes the SQL query string is passed as a keyword argument named 'query'.
+
+    Applied OUTSIDE @with_db_connection, so the cache is consulted before a
+    connection is ever checked out: a hit returns without touching the pool
+    or the database at all.
     """
+    func_name = func.__name__ # Looked up once at decoration time, not per call
     @functools.wraps(func)
-    def wrapper(conn, *args, **kwargs): # conn is passed by @with_db_connection
+    def wrapper(*args, **kwargs): # No conn here — checkout happens on miss
         # The cache key should uniquely identify the query and its parameters
         # For simplicity, we'll use the 'query' argument and other relevant kwargs as a key.
         # It's important that the key is hashable (e.g., a tuple).
@@ -55,50 +123,43 @@ def cache_query(func):
         # Extract the query string from kwargs
         sql_query = kwargs.get('query')
         if not sql_query:
-            logging.warning(f"Function {func.__name__} decorated with @cache_query but no 'query' keyword argument found. Caching will not apply.")
-            return func(conn, *args, **kwargs) # Execute without caching if no query string
-
-        # Create a cache key using the query and any other relevant parameters
-        # For a simple SELECT, the query string itself is often enough.
-        # For parameterized queries, combine query with its parameters.
-        # We need to make sure parameters are hashable, so convert lists/dicts if necessary.
-        cache_key_parts = [sql_query]
-        # Include relevant parameters in the cache key
-        for arg in args:
-            cache_key_parts.append(arg)
-        # Sort kwargs to ensure consistent key generation
-        for k, v in sorted(kwargs.items()):
-            if k != 'query': # Don't duplicate 'query' in the key
-                cache_key_parts.append((k, v))
-
-        cache_key = tuple(cache_key_parts)
-
-
-        if cache_key in query_cache:
-            logging.info(f"--- Cache Hit for {func.__name__} ---")
-            # Return a copy to prevent external modification of cached data
-            return [sqlite3.Row(row) for row in query_cache[cache_key]] if query_cache[cache_key] else []
-        else:
-            logging.info(f"--- Cache Miss for {func.__name__} ---")
-            # Execute the original function if not in cache
-            result = func(conn, *args, **kwargs)
+            logger.warning("Function %s decorated with @cache_query but no 'query' keyword argument found. Caching will not apply.", func_name)
+            return func(*args, **kwargs) # Execute without caching if no query string
 
-            # Cache the result. sqlite3.Row objects are not directly mutable/hashable
-            # for long-term storage if they come from cursor.fetchall().
-            # Convert them to tuples or lists of their values if they are from fetchall()
-            # to be truly cacheable. Or store the raw values.
-            # Assuming results are lists of sqlite3.Row objects:
-            if isinstance(result, list) and all(isinstance(r, sqlite3.Row) for r in result):
-                # Convert rows to plain tuples for caching
-                cacheable_result = [tuple(row) for row in result]
-            else:
-                cacheable_result = result # Store as is if not rows
+        # Create a cache key from the query and its parameters. frozenset
+        # makes the kwargs order-insensitive without a per-call sorted(),
+        # and the flat tuple avoids rebuilding a list piecewise.
+        # Collapsing runs of whitespace first means the same statement
+        # written with different line breaks or indentation shares one
+        # cache entry instead of each spelling re-hitting the database.
+        cache_key = (
+            " ".join(sql_query.split()),
+            args,
+            frozenset((k, v) for k, v in kwargs.items() if k != 'query')
+        )
+
+        try:
+            # Hit: hand back the cached list as-is. No per-row rewrapping —
+            # the old [sqlite3.Row(row) for ...] wasn't even a valid
+            # constructor call, and rebuilding N objects per hit would
+            # defeat the point of caching.
+            cached_result = query_cache[cache_key]
+            logger.info("--- Cache Hit for %s ---", func_name)
+            return cached_result
+        except KeyError:
+            logger.info("--- Cache Miss for %s ---", func_name)
+            # Miss: only now does @with_db_connection check a connection out
+            result = func(*args, **kwargs)
 
-            query_cache[cache_key] = cacheable_result
-            logging.info(f"--- Cached result for {func.__name__} ---")
+            # Convert sqlite3.Row results to plain dicts once at store time;
+            # the same list is then served on every subsequent hit, keeping
+            # name-based access (row['name']) for callers.
+            if isinstance(result, list) and all(isinstance(r, sqlite3.Row) for r in result):
+                result = [dict(row) for row in result]
 
-            # Return a copy of the actual result to the caller (re-materialize sqlite3.Row if needed)
-            return [sqlite3.Row(row) for row in cacheable_result] if cacheable_result else []
+            query_cache[cache_key] = result
+            logger.info("--- Cached result for %s ---", func_name)
+            return result
 
     return wrapper
 
@@ -107,6 +168,11 @@ def setup_database():
     conn = None
     try:
         conn = sqlite3.connect('users.db')
+        # Same WAL/sync/cache tuning the pooled connections get: commits
+        # append to the WAL instead of rewriting a rollback journal, and
+        # synchronous=NORMAL drops the second fsync per commit.
+        for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "cache_size=-64000"):
+            conn.execute(f"PRAGMA {pragma}")
         cursor = conn.cursor()
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS users (
@@ -116,14 +182,15 @@ def setup_database():
             )
         ''')
         conn.commit()
-        try:
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Blandine", "blandine@example.com"))
-            cursor.execute("INSERT INTO users (name, email) VALUES (?, ?)", ("Alice", "alice@example.com"))
-            conn.commit()
-            logging.info("Inserted test users (if not present).")
-        except sqlite3.IntegrityError:
-            logging.info("Test users already exist in users table.")
-            conn.rollback()
+        # Seed both rows in one transaction: a single executemany + commit
+        # replaces per-row commits, and INSERT OR IGNORE removes the
+        # IntegrityError/rollback branch on re-runs.
+        with conn:
+            cursor.executemany(
+                "INSERT OR IGNORE INTO users (name, email) VALUES (?, ?)",
+                [("Blandine", "blandine@example.com"), ("Alice", "alice@example.com")]
+            )
+        logging.info("Seeded test users (existing rows ignored).")
     except sqlite3.Error as e:
         logging.error(f"Error setting up database: {e}")
     finally:
@@ -133,19 +200,19 @@ def setup_database():
 # Call setup before operations
 setup_database()
 
-@with_db_connection
+# @cache_query sits outside @with_db_connection so cache hits never
+# check a connection out of the pool.
 @cache_query
+@with_db_connection
 def fetch_users_with_cache(conn, query, user_id=None): # Added user_id for parameterized query example
     """
     Fetches users from the database, demonstrating caching.
     """
     logging.info(f"Executing actual database query: '{query}' with user_id={user_id}")
-    cursor = conn.cursor()
+    # conn.execute() uses an implicit cursor — one less object per read
     if user_id:
-        cursor.execute(query, (user_id,))
-    else:
-        cursor.execute(query)
-    return cursor.fetchall()
+        return conn.execute(query, (user_id,)).fetchall()
+    return conn.execute(query).fetchall()
 
 #### First call will cache the result
 print("\n--- First call: SELECT * FROM users (should be a cache miss) ---")
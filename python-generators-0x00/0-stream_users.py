@@ -1,20 +1,31 @@
+from collections import namedtuple
+
 import mysql.connector
 from mysql.connector import Error
+from seed import USE_PURE
 
 def stream_users():
     try:
+        # Same per-interpreter gate as seed.py: the C extension protocol
+        # implementation on CPython, pure Python under PyPy. Passing
+        # use_pure=False explicitly would raise ImportError where the
+        # extension is missing instead of falling back.
         connection = mysql.connector.connect(
             host="localhost",
             user="alx_user",
             password="alx_password",
-            database="ALX_prodev"
+            database="ALX_prodev",
+            use_pure=USE_PURE
         )
 
         if connection.is_connected():
-            cursor = connection.cursor(dictionary=True)
+            # A plain tuple cursor skips building a dict per row; rows are
+            # rewrapped in a namedtuple so callers keep attribute access
+            # (user.name) at a fraction of a dict's per-row cost.
+            cursor = connection.cursor()
             cursor.execute("SELECT * FROM user_data")
-            for row in cursor:
-                yield row
+            User = namedtuple("User", cursor.column_names)
+            yield from (User._make(row) for row in cursor)
 
             cursor.close()
             connection.close()
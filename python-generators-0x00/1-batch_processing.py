@@ -1,32 +1,63 @@
 import mysql.connector
 from mysql.connector import Error
-from seed import connect_to_prodev
+from seed import get_pooled_connection
 
 
 def stream_users_in_batches(batch_size):
     """
     Generator that yields user rows in batches of batch_size.
+
+    Uses an unbuffered cursor so rows stream from the server as they are
+    consumed — a buffered cursor would fetch the entire table client-side
+    before fetchmany ever sliced it, defeating the point of batching.
+    """
+    connection = get_pooled_connection()
+    cursor = connection.cursor(dictionary=True, buffered=False)
+    cursor.arraysize = batch_size
+
+    try:
+        cursor.execute("SELECT * FROM user_data")
+
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        # Runs even if the consumer abandons the generator early;
+        # close() returns the pooled connection rather than dropping it
+        cursor.close()
+        connection.close()
+
+
+def stream_users_over(age, batch_size):
     """
-    connection = connect_to_prodev()
-    cursor = connection.cursor(dictionary=True)
+    Generator that yields batches of users older than age.
 
-    cursor.execute("SELECT * FROM user_data")
+    The age filter runs server-side in the WHERE clause, so rows that
+    would fail the check never cross the wire or get decoded into dicts.
+    """
+    connection = get_pooled_connection()
+    cursor = connection.cursor(dictionary=True, buffered=False)
+    cursor.arraysize = batch_size
 
-    while True:
-        batch = cursor.fetchmany(batch_size)
-        if not batch:
-            break
-        yield batch
+    try:
+        cursor.execute("SELECT * FROM user_data WHERE age > %s", (age,))
 
-    cursor.close()
-    connection.close()
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield batch
+    finally:
+        cursor.close()
+        connection.close()
 
 
 def batch_processing(batch_size):
     return (
         user
-        for batch in stream_users_in_batches(batch_size)
+        for batch in stream_users_over(25, batch_size)
         for user in batch
-        if user['age'] > 25
     )
 
@@ -1,35 +1,104 @@
 import mysql.connector
-from seed import connect_to_prodev
+from seed import get_pooled_connection
+
+# Rows pulled from the cursor per fetchmany round trip
+AGE_FETCH_BATCH = 10_000
+
+def stream_age_batches(batch_size=AGE_FETCH_BATCH):
+    """
+    Generator that yields lists of up to batch_size ages.
+
+    Fetching 10k rows per cursor call amortises the per-fetch overhead that
+    iterating the cursor row by row would pay for every single age.
+    """
+    connection = get_pooled_connection()
+    # Prepared cursors use the binary protocol: the statement is parsed
+    # once server-side and row values arrive in binary form instead of
+    # being rendered to text and re-parsed per row.
+    cursor = connection.cursor(prepared=True)
+
+    try:
+        cursor.execute("SELECT age FROM user_data")
+
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            yield [row[0] for row in batch]  # each row is a tuple like (age,)
+    finally:
+        # close() returns the pooled connection rather than dropping it
+        cursor.close()
+        connection.close()
+
 
 def stream_user_ages():
     """
     Generator to yield user ages one by one from the database.
+
+    Same per-age interface as before, but backed by the batched fetch so
+    the cursor is hit once per 10k ages instead of once per age.
     """
-    connection = connect_to_prodev()
-    cursor = connection.cursor()
+    for batch in stream_age_batches():
+        yield from batch
 
-    cursor.execute("SELECT age FROM user_data")
 
-    for row in cursor:
-        yield row[0]  # row is a tuple like (age,)
+def average_age_sql():
+    """
+    Computes (average, count) of user ages server-side in one round trip.
 
-    cursor.close()
-    connection.close()
+    MySQL aggregates the column itself, so a single row comes back over
+    the wire instead of one value per user.
+    """
+    connection = get_pooled_connection()
+    cursor = connection.cursor()
 
+    try:
+        cursor.execute("SELECT AVG(age), COUNT(*) FROM user_data")
+        average, count = cursor.fetchone()
+        return average, count
+    finally:
+        cursor.close()
+        connection.close()
 
-def calculate_average_age():
+
+def average_age_local():
     """
-    Calculates and prints the average age using a generator.
+    Computes (average, count) client-side from the age stream.
+
+    Accumulates a running total and count per 10k-age batch: each batch is
+    reduced by np.fromiter + sum in C, so no full copy of the column is
+    ever held in memory. Kept as the fallback for when the aggregate must
+    run locally.
     """
+    # Imported lazily so the module keeps working where numpy isn't
+    # installed; builtin sum over each batch is the degraded path.
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
     total = 0
     count = 0
 
-    for age in stream_user_ages():
-        total += age
-        count += 1
+    for batch in stream_age_batches():
+        if np is not None:
+            total += int(np.fromiter(batch, dtype=np.int32).sum())
+        else:
+            total += sum(batch)
+        count += len(batch)
+
+    if count == 0:
+        return None, 0
+    return total / count, count
+
+
+def calculate_average_age():
+    """
+    Calculates and prints the average age using a server-side aggregate.
+    """
+    average, count = average_age_sql()
 
     if count > 0:
-        average = total / count
         print(f"Average age of users: {average:.2f}")
     else:
         print("No users found.")